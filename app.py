@@ -1,8 +1,4 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import pickle
-import os
 
 # ======================================================
 # ✅ Streamlit 页面设置
@@ -13,37 +9,6 @@ st.set_page_config(
     page_icon="🌡"
 )
 
-# ======================================================
-# 模型加载
-# ======================================================
-@st.cache_resource
-def load_model():
-    try:
-        with open("catboost_model.pkl", "rb") as f:
-            model = pickle.load(f)
-        return model
-    except FileNotFoundError:
-        st.error("❌ Model file 'catboost_model.pkl' not found.")
-        st.stop()
-    except Exception as e:
-        st.error(f"❌ Failed to load model: {e}")
-        st.stop()
-
-model = load_model()
-
-# ======================================================
-# 标准化参数加载
-# ======================================================
-def load_scaler_params():
-    if not (os.path.exists("feature_means.csv") and os.path.exists("feature_stds.csv")):
-        st.error("❌ Standardization parameter files not found.")
-        st.stop()
-    means = pd.read_csv("feature_means.csv", index_col=0).squeeze()
-    stds = pd.read_csv("feature_stds.csv", index_col=0).squeeze()
-    return means, stds
-
-means, stds = load_scaler_params()
-
 # ======================================================
 # 页面标题与介绍
 # ======================================================
@@ -54,102 +19,29 @@ st.markdown("""
 """)
 
 # ======================================================
-# 输入部分
+# 模型与标准化参数加载（见 rao_core）
 # ======================================================
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("Clinical Parameters")
-    Compressiontime = st.number_input(
-        "Compression Time (minutes)",
-        min_value=30.0,
-        max_value=400.0,
-        value=120.0,
-        step=5.0,
-        help="Typically 120–180 minutes"
-    )
-    IntraopNTG = st.number_input(
-        "Intraoperative Nitroglycerin Dose (μg)",
-        min_value=0.0,
-        max_value=900.0,
-        value=200.0,
-        step=50.0,
-        help="Common dose: 100–500 μg"
-    )
-    PreRaddiam = st.number_input(
-        "Pre-procedural Radial Artery Diameter (mm)",
-        min_value=0.5,
-        max_value=3.8,
-        value=2.5,
-        step=0.1,
-        help="Measured via ultrasound"
-    )
-    SRratio = st.number_input(
-        "Sheath-to-Artery Ratio",
-        min_value=0.1,
-        max_value=2.0,
-        value=0.6,
-        step=0.05,
-        help="Sheath outer diameter / artery diameter"
-    )
-
-with col2:
-    st.subheader("Categorical Variables")
-    Heparincategory = st.radio(
-        "Heparin Category",
-        options=["1", "2"],
-        index=0,
-        format_func=lambda x: "≤5000 IU" if x == "1" else "≥5000 IU"
-    )
-    Punctureattempts = st.radio(
-        "Puncture Attempts",
-        options=["1", "2"],
-        index=0,
-        format_func=lambda x: "Single Puncture" if x == "1" else "Multiple Punctures"
-    )
-    Priorradpunctures = st.radio(
-        "History of Prior Radial Artery Catheterization",
-        options=["0", "1"],
-        index=0,
-        format_func=lambda x: "No" if x == "0" else "Yes"
-    )
+# 先渲染标题再导入 numpy/catboost，冷启动时页面可更早显示
+try:
+    from rao_core import RISK_DETAILS, predict_risk_fast
+except FileNotFoundError as e:
+    st.error(f"❌ Required file '{e.filename}' not found.")
+    st.stop()
+except ValueError as e:
+    # rao_core 仅在标准化参数文件为空、格式错误、缺少特征或数值无法解析时抛出 ValueError
+    st.error(f"❌ Invalid standardization parameter files: {e}")
+    st.stop()
+except Exception as e:
+    st.error(f"❌ Failed to load model: {e}")
+    st.stop()
 
 # ======================================================
 # 预测逻辑
 # ======================================================
-def predict_risk(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
-                 Heparincategory, Punctureattempts, Priorradpunctures):
-    try:
-        # 输入验证
-        if any(v is None for v in [Compressiontime, IntraopNTG, PreRaddiam, SRratio]):
-            return "❌ Please fill in all required numerical parameters"
-        
-        df = pd.DataFrame([{
-            "Compressiontime": Compressiontime,
-            "Intraoperativenitroglycerindose": IntraopNTG,
-            "PreRaddiam": PreRaddiam / 10,  # 转换成 cm
-            "SRratio": SRratio,
-            "Heparincategory": int(Heparincategory),
-            "Punctureattempts": int(Punctureattempts),
-            "History of prior radial artery catheterization": int(Priorradpunctures)
-        }])
-
-        num_features = ['Compressiontime', 'Intraoperativenitroglycerindose', 'PreRaddiam', 'SRratio']
-        df[num_features] = (df[num_features] - means[num_features]) / stds[num_features]
-
-        prob = model.predict_proba(df)[0][1]
-
-        if prob < 0.05:
-            risk_level, color, suggestion = "Low Risk", "🟢", "Routine care recommended"
-        elif prob < 0.15:
-            risk_level, color, suggestion = "Medium Risk", "🟡", "Enhanced post-operative monitoring advised"
-        else:
-            risk_level, color, suggestion = "High Risk", "🔴", "Preventive measures and close monitoring required"
-
-        return f"""
-{color} **Prediction Result: {risk_level}**
+RESULT_TEMPLATE = """
+{color} **Prediction Result: {level}**
 
-**RAO Probability:** {prob * 100:.2f}%
+**RAO Probability:** {pct:.2f}%
 
 **Clinical Recommendation:** {suggestion}
 
@@ -157,21 +49,128 @@ def predict_risk(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
 
 *Prediction based on CatBoost machine learning model — for reference only.*
 """
-    except Exception as e:
-        return f"❌ Prediction failed: {str(e)}"
 
-# ======================================================
-# 按钮区
-# ======================================================
-if st.button("🚀 Calculate RAO Risk"):
-    result = predict_risk(
+# 输入为离散步长的数值与类别变量，结果可按输入缓存；
+# 只缓存 (概率, 风险等级)，异常不会被缓存，失败后下次点击会重新计算
+@st.cache_data(ttl=3600)
+def cached_prediction(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+                      Heparincategory, Punctureattempts, Priorradpunctures):
+    return predict_risk_fast(
         Compressiontime, IntraopNTG, PreRaddiam, SRratio,
         Heparincategory, Punctureattempts, Priorradpunctures
     )
-    st.markdown(result)
 
-if st.button("🔄 Reset"):
-    st.rerun()
+def predict_risk(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+                 Heparincategory, Punctureattempts, Priorradpunctures):
+    try:
+        # 输入验证
+        if any(v is None for v in [Compressiontime, IntraopNTG, PreRaddiam, SRratio]):
+            return "❌ Please fill in all required numerical parameters"
+        
+        prob, risk_level = cached_prediction(
+            Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+            Heparincategory, Punctureattempts, Priorradpunctures
+        )
+        color, suggestion = RISK_DETAILS[risk_level]
+
+        return RESULT_TEMPLATE.format(color=color, level=risk_level, pct=prob * 100, suggestion=suggestion)
+    except Exception as e:
+        return f"❌ Prediction failed: {str(e)}"
+
+# ======================================================
+# 输入部分
+# ======================================================
+# 默认输入值；重置时通过回调写回 session_state，无需整页 rerun
+DEFAULT_INPUTS = {
+    "Compressiontime": 120.0,
+    "IntraopNTG": 200.0,
+    "PreRaddiam": 2.5,
+    "SRratio": 0.6,
+    "Heparincategory": "1",
+    "Punctureattempts": "1",
+    "Priorradpunctures": "0",
+}
+
+for key, value in DEFAULT_INPUTS.items():
+    st.session_state.setdefault(key, value)
+
+def reset_inputs():
+    st.session_state.update(DEFAULT_INPUTS)
+
+# 计算器部分作为 fragment：提交或重置时只重跑这一段，标题与页脚不再重复执行
+@st.fragment
+def calculator():
+    with st.form("inputs"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Clinical Parameters")
+            Compressiontime = st.number_input(
+                "Compression Time (minutes)",
+                key="Compressiontime",
+                min_value=30.0,
+                max_value=400.0,
+                step=5.0,
+                help="Typically 120–180 minutes"
+            )
+            IntraopNTG = st.number_input(
+                "Intraoperative Nitroglycerin Dose (μg)",
+                key="IntraopNTG",
+                min_value=0.0,
+                max_value=900.0,
+                step=50.0,
+                help="Common dose: 100–500 μg"
+            )
+            PreRaddiam = st.number_input(
+                "Pre-procedural Radial Artery Diameter (mm)",
+                key="PreRaddiam",
+                min_value=0.5,
+                max_value=3.8,
+                step=0.1,
+                help="Measured via ultrasound"
+            )
+            SRratio = st.number_input(
+                "Sheath-to-Artery Ratio",
+                key="SRratio",
+                min_value=0.1,
+                max_value=2.0,
+                step=0.05,
+                help="Sheath outer diameter / artery diameter"
+            )
+
+        with col2:
+            st.subheader("Categorical Variables")
+            Heparincategory = st.radio(
+                "Heparin Category",
+                key="Heparincategory",
+                options=["1", "2"],
+                format_func=lambda x: "≤5000 IU" if x == "1" else "≥5000 IU"
+            )
+            Punctureattempts = st.radio(
+                "Puncture Attempts",
+                key="Punctureattempts",
+                options=["1", "2"],
+                format_func=lambda x: "Single Puncture" if x == "1" else "Multiple Punctures"
+            )
+            Priorradpunctures = st.radio(
+                "History of Prior Radial Artery Catheterization",
+                key="Priorradpunctures",
+                options=["0", "1"],
+                format_func=lambda x: "No" if x == "0" else "Yes"
+            )
+
+        submitted = st.form_submit_button("🚀 Calculate RAO Risk")
+
+    if submitted:
+        result = predict_risk(
+            Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+            Heparincategory, Punctureattempts, Priorradpunctures
+        )
+        st.markdown(result)
+
+    st.button("🔄 Reset", on_click=reset_inputs)
+
+calculator()
 
 # ======================================================
 # 页脚
@@ -0,0 +1,212 @@
+import bisect
+import csv
+import errno
+import logging
+import math
+import os
+import tempfile
+
+import numpy as np
+
+# ======================================================
+# 文件路径与特征定义
+# ======================================================
+# 路径相对本文件，确保从任意工作目录启动（Streamlit、FastAPI、测试）都能找到
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# CatBoost 原生二进制格式，由 catboost_model.pkl 一次性离线转换而来
+MODEL_PATH = os.path.join(BASE_DIR, "catboost_model.cbm")
+MEANS_PATH = os.path.join(BASE_DIR, "feature_means.csv")
+STDS_PATH = os.path.join(BASE_DIR, "feature_stds.csv")
+
+NUM_FEATURES = ("Compressiontime", "Intraoperativenitroglycerindose", "PreRaddiam", "SRratio")
+# 类别特征按 encode_features 的参数顺序列出；在模型中的实际列位置见 CAT_INDEX
+CAT_FEATURES = (
+    "Heparincategory",
+    "Punctureattempts",
+    "History of prior radial artery catheterization",
+)
+
+logger = logging.getLogger(__name__)
+
+# 单行预测无需线程池，固定单线程避免每次调用的线程启动开销
+PREDICT_THREADS = 1
+ONNX_MAX_PROB_SHIFT = 1e-3
+
+# 风险分层：概率 < 0.05 为低风险，< 0.15 为中风险，其余为高风险
+RISK_THRESHOLDS = (0.05, 0.15)
+RISK_LEVELS = ("Low Risk", "Medium Risk", "High Risk")
+RISK_DETAILS = {
+    "Low Risk": ("🟢", "Routine care recommended"),
+    "Medium Risk": ("🟡", "Enhanced post-operative monitoring advised"),
+    "High Risk": ("🔴", "Preventive measures and close monitoring required"),
+}
+
+# ======================================================
+# 模型与标准化参数加载
+# ======================================================
+def load_model():
+    from catboost import CatBoostClassifier
+
+    # CatBoost 对缺失文件抛出 CatBoostError，这里统一为 FileNotFoundError 便于前端提示
+    if not os.path.exists(MODEL_PATH):
+        raise FileNotFoundError(errno.ENOENT, "Model file not found", MODEL_PATH)
+    model = CatBoostClassifier()
+    model.load_model(MODEL_PATH)
+    return model
+
+def _load_stats(path):
+    # 统计文件只有几行 "特征名,数值"，用 csv 模块解析即可，无需 pandas
+    # 文件为空、行字段不足或数值无法解析时统一抛出 ValueError，由前端按标准化参数错误提示
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        if next(reader, None) is None:  # 跳过表头
+            raise ValueError(f"Standardization parameter file '{os.path.basename(path)}' is empty.")
+        stats = {}
+        for line_no, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            if len(row) < 2:
+                raise ValueError(
+                    f"Standardization parameter file '{os.path.basename(path)}' line {line_no}: "
+                    f"expected 'feature,value'."
+                )
+            stats[row[0]] = float(row[1])
+        return stats
+
+def load_scaler_params():
+    means = _load_stats(MEANS_PATH)
+    stds = _load_stats(STDS_PATH)
+    missing = [k for k in NUM_FEATURES if k not in means or k not in stds]
+    if missing:
+        raise ValueError(f"Standardization parameter files are missing features: {', '.join(missing)}")
+    # 按 NUM_FEATURES 顺序转为 float32 向量，预测时无需再做标签对齐
+    means = np.fromiter((means[k] for k in NUM_FEATURES), dtype=np.float32, count=len(NUM_FEATURES))
+    stds = np.fromiter((stds[k] for k in NUM_FEATURES), dtype=np.float32, count=len(NUM_FEATURES))
+    return means, stds
+
+# ======================================================
+# ONNX 推理会话（可选，onnxruntime 不可用时回退到 CatBoost）
+# ======================================================
+def onnx_predict_proba(session, input_name, X):
+    """返回 ONNX 会话对 X 各行的阳性类概率向量。"""
+    # CatBoost 导出的 probabilities 是 ZipMap（seq(map(int64, float))），每行为 {类别: 概率}
+    probabilities = session.run(["probabilities"], {input_name: np.ascontiguousarray(X)})[0]
+    return np.array([row[1] for row in probabilities], dtype=np.float64)
+
+def onnx_max_prob_shift(model, session, input_name, n_samples=256):
+    # 在随机样本上比较 ONNX 与 CatBoost 的概率，返回最大偏差
+    rng = np.random.default_rng(123)
+    x = np.empty((n_samples, len(FEATURE_ORDER)), dtype=np.float32)
+    x[:, NUM_INDEX] = rng.standard_normal((n_samples, len(NUM_FEATURES)))
+    x[:, CAT_INDEX] = rng.integers((1, 1, 0), (3, 3, 2), (n_samples, len(CAT_FEATURES)))
+    onnx_prob = onnx_predict_proba(session, input_name, x)
+    model_prob = model.predict_proba(x)[:, 1]
+    return float(np.max(np.abs(onnx_prob - model_prob)))
+
+def load_onnx_session(model):
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return None, None
+    try:
+        # 导出到临时目录并以字节加载，不在工作目录留下文件
+        with tempfile.TemporaryDirectory() as tmp:
+            onnx_path = os.path.join(tmp, "model.onnx")
+            model.save_model(onnx_path, format="onnx")
+            with open(onnx_path, "rb") as f:
+                onnx_model = f.read()
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = 1
+        session = ort.InferenceSession(onnx_model, sess_options=opts, providers=["CPUExecutionProvider"])
+        input_name = session.get_inputs()[0].name
+        shift = onnx_max_prob_shift(model, session, input_name)
+    except Exception:
+        logger.warning("ONNX export or validation failed; using CatBoost for prediction.", exc_info=True)
+        return None, None
+    if not shift < ONNX_MAX_PROB_SHIFT:
+        logger.warning(
+            "ONNX probabilities differ from CatBoost by %.2e (limit %.0e); using CatBoost for prediction.",
+            shift, ONNX_MAX_PROB_SHIFT
+        )
+        return None, None
+    return session, input_name
+
+# 导入时加载一次，所有前端共享
+MODEL = load_model()
+
+# 列顺序以模型训练时记录的 feature_names_ 为准；原先的 DataFrame 路径按列名匹配，
+# 改用 ndarray 后必须按名称定位每一列
+FEATURE_ORDER = tuple(MODEL.feature_names_)
+if sorted(FEATURE_ORDER) != sorted(NUM_FEATURES + CAT_FEATURES):
+    raise RuntimeError(f"Model features {FEATURE_ORDER} do not match the calculator inputs.")
+NUM_INDEX = np.array([FEATURE_ORDER.index(k) for k in NUM_FEATURES])
+CAT_INDEX = np.array([FEATURE_ORDER.index(k) for k in CAT_FEATURES])
+
+MEANS, STDS = load_scaler_params()
+# (x - mean) / std 改写为 x * INV_STDS + NEG_MEANS_OVER_STDS，预测时只需一次乘加
+INV_STDS = (1.0 / STDS).astype(np.float32)
+NEG_MEANS_OVER_STDS = (-MEANS * INV_STDS).astype(np.float32)
+# PreRaddiam 以 mm 输入、以 cm 标准化，把 mm→cm 的 0.1 并入缩放系数
+SCALE = INV_STDS.copy()
+SCALE[NUM_FEATURES.index("PreRaddiam")] *= np.float32(0.1)
+ONNX_SESSION, ONNX_INPUT = load_onnx_session(MODEL)
+
+# ======================================================
+# 预测逻辑
+# ======================================================
+def predict_probability(x):
+    if ONNX_SESSION is not None:
+        return float(onnx_predict_proba(ONNX_SESSION, ONNX_INPUT, x)[0])
+    # 二分类模型直接取原始分值再做 sigmoid，跳过 predict_proba 的概率后处理
+    try:
+        raw = MODEL.predict(x, prediction_type="RawFormulaVal", thread_count=PREDICT_THREADS)
+        return 1.0 / (1.0 + math.exp(-float(raw[0])))
+    except (TypeError, ValueError):
+        # 非二分类模型（原始分值为多列）时退回 predict_proba
+        return float(MODEL.predict_proba(x, thread_count=PREDICT_THREADS)[0, 1])
+
+def predict_probability_batch(X):
+    """对 (B, 7) 特征矩阵一次性打分，返回长度为 B 的概率向量。"""
+    if ONNX_SESSION is not None:
+        return onnx_predict_proba(ONNX_SESSION, ONNX_INPUT, X)
+    X = np.asfortranarray(X)
+    raw = MODEL.predict(X, prediction_type="RawFormulaVal", thread_count=PREDICT_THREADS)
+    if raw.ndim == 1:
+        return 1.0 / (1.0 + np.exp(-raw))
+    return MODEL.predict_proba(X, thread_count=PREDICT_THREADS)[:, 1]
+
+def warm_up():
+    # 首次预测会触发延迟初始化，启动时先空跑一次，避免第一位用户承担该开销
+    try:
+        predict_probability(np.zeros((1, len(FEATURE_ORDER)), dtype=np.float32, order="F"))
+    except Exception:
+        logger.warning("Warm-up prediction failed.", exc_info=True)
+
+warm_up()
+
+def classify_risk(prob):
+    # bisect_right 返回不大于 prob 的阈值个数，即风险等级下标（prob 等于阈值时归入更高一级）
+    return RISK_LEVELS[bisect.bisect_right(RISK_THRESHOLDS, prob)]
+
+def encode_features(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+                    Heparincategory, Punctureattempts, Priorradpunctures):
+    """把原始输入编码为 (1, 7) 的模型特征行，PreRaddiam 以 mm 输入。"""
+    # float32 列主序数组可直接走 CatBoost 的零拷贝路径，避免构造 DataFrame
+    x = np.empty((1, len(FEATURE_ORDER)), dtype=np.float32, order="F")
+    x[0, NUM_INDEX] = np.array(
+        [Compressiontime, IntraopNTG, PreRaddiam, SRratio],
+        dtype=np.float32
+    ) * SCALE + NEG_MEANS_OVER_STDS
+    x[0, CAT_INDEX] = (int(Heparincategory), int(Punctureattempts), int(Priorradpunctures))
+    return x
+
+def predict_risk_fast(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+                      Heparincategory, Punctureattempts, Priorradpunctures):
+    """返回 (RAO 概率, 风险等级)，PreRaddiam 以 mm 输入。"""
+    prob = predict_probability(encode_features(
+        Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+        Heparincategory, Punctureattempts, Priorradpunctures
+    ))
+    return prob, classify_risk(prob)
@@ -0,0 +1,112 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Literal
+
+import numpy as np
+from fastapi import FastAPI
+from pydantic import BaseModel, Field
+
+from rao_core import RISK_DETAILS, classify_risk, encode_features, predict_probability_batch
+
+# ======================================================
+# 微批处理参数
+# ======================================================
+# 在 BATCH_WINDOW 秒内到达的请求合并为一次模型调用，最多 MAX_BATCH 行
+BATCH_WINDOW = 0.005
+MAX_BATCH = 32
+
+# ======================================================
+# 请求格式（取值范围与 Streamlit 界面一致）
+# ======================================================
+class RiskInput(BaseModel):
+    Compressiontime: float = Field(ge=30.0, le=400.0, description="Compression time (minutes)")
+    IntraopNTG: float = Field(ge=0.0, le=900.0, description="Intraoperative nitroglycerin dose (μg)")
+    PreRaddiam: float = Field(ge=0.5, le=3.8, description="Pre-procedural radial artery diameter (mm)")
+    SRratio: float = Field(ge=0.1, le=2.0, description="Sheath-to-artery ratio")
+    Heparincategory: Literal[1, 2]
+    Punctureattempts: Literal[1, 2]
+    Priorradpunctures: Literal[0, 1]
+
+# ======================================================
+# 批处理后台任务
+# ======================================================
+def fail_futures(items, exc):
+    for _, future in items:
+        if not future.done():
+            future.set_exception(exc)
+
+async def batch_worker(queue):
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = []
+        try:
+            batch.append(await queue.get())
+            deadline = loop.time() + BATCH_WINDOW
+            while len(batch) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            X = np.concatenate([row for row, _ in batch])
+            # 模型调用放到线程中执行，避免阻塞事件循环
+            probs = await asyncio.to_thread(predict_probability_batch, X)
+        except asyncio.CancelledError:
+            # 关闭服务时，正在处理的请求直接失败，不让调用方一直等待
+            fail_futures(batch, RuntimeError("Server is shutting down"))
+            raise
+        except Exception as e:
+            fail_futures(batch, e)
+            continue
+        for (_, future), prob in zip(batch, probs):
+            if not future.done():
+                future.set_result(float(prob))
+
+@asynccontextmanager
+async def lifespan(app):
+    queue = asyncio.Queue()
+    app.state.queue = queue
+    worker = asyncio.create_task(batch_worker(queue))
+    yield
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+    # 仍在队列中、尚未进入批次的请求同样失败返回
+    pending = []
+    while not queue.empty():
+        pending.append(queue.get_nowait())
+    fail_futures(pending, RuntimeError("Server is shutting down"))
+
+app = FastAPI(title="RAO Risk Calculator", lifespan=lifespan)
+
+# ======================================================
+# 预测接口
+# ======================================================
+@app.post("/predict")
+async def predict(data: RiskInput):
+    row = encode_features(
+        data.Compressiontime, data.IntraopNTG, data.PreRaddiam, data.SRratio,
+        data.Heparincategory, data.Punctureattempts, data.Priorradpunctures
+    )
+    future = asyncio.get_running_loop().create_future()
+    await app.state.queue.put((row, future))
+    prob = await future
+
+    risk_level = classify_risk(prob)
+    _, suggestion = RISK_DETAILS[risk_level]
+    return {
+        "probability": prob,
+        "risk_level": risk_level,
+        "recommendation": suggestion,
+    }
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
@@ -0,0 +1,119 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("catboost")
+
+import rao_core
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ======================================================
+# 基线实现：命名 DataFrame + pandas 标准化（与最初 app.py 一致）
+# ======================================================
+with open(os.path.join(BASE_DIR, "catboost_model.pkl"), "rb") as f:
+    BASELINE_MODEL = pickle.load(f)
+BASELINE_MEANS = pd.read_csv(os.path.join(BASE_DIR, "feature_means.csv"), index_col=0).squeeze()
+BASELINE_STDS = pd.read_csv(os.path.join(BASE_DIR, "feature_stds.csv"), index_col=0).squeeze()
+
+def baseline_predict(Compressiontime, IntraopNTG, PreRaddiam, SRratio,
+                     Heparincategory, Punctureattempts, Priorradpunctures):
+    df = pd.DataFrame([{
+        "Compressiontime": Compressiontime,
+        "Intraoperativenitroglycerindose": IntraopNTG,
+        "PreRaddiam": PreRaddiam / 10,
+        "SRratio": SRratio,
+        "Heparincategory": int(Heparincategory),
+        "Punctureattempts": int(Punctureattempts),
+        "History of prior radial artery catheterization": int(Priorradpunctures)
+    }])
+    num_features = ['Compressiontime', 'Intraoperativenitroglycerindose', 'PreRaddiam', 'SRratio']
+    df[num_features] = (df[num_features] - BASELINE_MEANS[num_features]) / BASELINE_STDS[num_features]
+    return BASELINE_MODEL.predict_proba(df)[0][1]
+
+def random_inputs(n, seed=0):
+    # 取值范围与 Streamlit 界面一致
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield (
+            float(rng.uniform(30.0, 400.0)),
+            float(rng.uniform(0.0, 900.0)),
+            float(rng.uniform(0.5, 3.8)),
+            float(rng.uniform(0.1, 2.0)),
+            str(rng.integers(1, 3)),
+            str(rng.integers(1, 3)),
+            str(rng.integers(0, 2)),
+        )
+
+# ======================================================
+# 测试
+# ======================================================
+def test_feature_order_matches_model():
+    assert rao_core.FEATURE_ORDER == tuple(BASELINE_MODEL.feature_names_)
+
+def test_default_inputs_match_baseline():
+    args = (120.0, 200.0, 2.5, 0.6, "1", "1", "0")
+    prob, risk_level = rao_core.predict_risk_fast(*args)
+    expected = baseline_predict(*args)
+    assert prob == pytest.approx(expected, abs=1e-4)
+    assert risk_level == rao_core.classify_risk(expected)
+
+def test_predict_risk_fast_matches_baseline():
+    for args in random_inputs(500):
+        prob, risk_level = rao_core.predict_risk_fast(*args)
+        expected = baseline_predict(*args)
+        assert prob == pytest.approx(expected, abs=1e-4), args
+        assert risk_level == rao_core.classify_risk(expected), args
+
+def test_predict_probability_batch_matches_single_row():
+    rows = [rao_core.encode_features(*args) for args in random_inputs(64, seed=1)]
+    batch = rao_core.predict_probability_batch(np.concatenate(rows))
+    single = [rao_core.predict_probability(row) for row in rows]
+    np.testing.assert_allclose(batch, single, atol=1e-6)
+
+def test_onnx_predict_proba_matches_model(tmp_path):
+    ort = pytest.importorskip("onnxruntime")
+    onnx_path = str(tmp_path / "model.onnx")
+    rao_core.MODEL.save_model(onnx_path, format="onnx")
+    session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    X = np.concatenate([rao_core.encode_features(*args) for args in random_inputs(64, seed=2)])
+    onnx_prob = rao_core.onnx_predict_proba(session, session.get_inputs()[0].name, X)
+    np.testing.assert_allclose(onnx_prob, rao_core.MODEL.predict_proba(X)[:, 1], atol=1e-5)
+
+def test_onnx_session_enabled_when_onnxruntime_available():
+    pytest.importorskip("onnxruntime")
+    assert rao_core.ONNX_SESSION is not None
+    assert rao_core.onnx_max_prob_shift(
+        rao_core.MODEL, rao_core.ONNX_SESSION, rao_core.ONNX_INPUT
+    ) < rao_core.ONNX_MAX_PROB_SHIFT
+
+@pytest.mark.parametrize("content", [
+    "",
+    ",0\nCompressiontime\n",
+    ",0\nCompressiontime,abc\n",
+])
+def test_load_stats_rejects_malformed_files(tmp_path, content):
+    path = tmp_path / "stats.csv"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        rao_core._load_stats(str(path))
+
+def test_catboost_path_matches_baseline(monkeypatch):
+    # 关闭 ONNX，覆盖 RawFormulaVal + sigmoid 路径（ONNX 被拒绝时的回退路径）
+    monkeypatch.setattr(rao_core, "ONNX_SESSION", None)
+    for args in random_inputs(200, seed=3):
+        prob, risk_level = rao_core.predict_risk_fast(*args)
+        expected = baseline_predict(*args)
+        assert prob == pytest.approx(expected, abs=1e-6), args
+        assert risk_level == rao_core.classify_risk(expected), args
+
+def test_catboost_batch_path_matches_baseline(monkeypatch):
+    monkeypatch.setattr(rao_core, "ONNX_SESSION", None)
+    inputs = list(random_inputs(64, seed=4))
+    batch = rao_core.predict_probability_batch(
+        np.concatenate([rao_core.encode_features(*args) for args in inputs])
+    )
+    np.testing.assert_allclose(batch, [baseline_predict(*args) for args in inputs], atol=1e-6)
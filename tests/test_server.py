@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("catboost")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+import rao_core
+import server
+
+DEFAULT_BODY = {
+    "Compressiontime": 120.0,
+    "IntraopNTG": 200.0,
+    "PreRaddiam": 2.5,
+    "SRratio": 0.6,
+    "Heparincategory": 1,
+    "Punctureattempts": 1,
+    "Priorradpunctures": 0,
+}
+
+def random_bodies(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield {
+            "Compressiontime": float(rng.uniform(30.0, 400.0)),
+            "IntraopNTG": float(rng.uniform(0.0, 900.0)),
+            "PreRaddiam": float(rng.uniform(0.5, 3.8)),
+            "SRratio": float(rng.uniform(0.1, 2.0)),
+            "Heparincategory": int(rng.integers(1, 3)),
+            "Punctureattempts": int(rng.integers(1, 3)),
+            "Priorradpunctures": int(rng.integers(0, 2)),
+        }
+
+def expected_response(body):
+    prob, risk_level = rao_core.predict_risk_fast(*body.values())
+    return prob, risk_level, rao_core.RISK_DETAILS[risk_level][1]
+
+@pytest.fixture
+def client():
+    with TestClient(server.app) as client:
+        yield client
+
+# ======================================================
+# 接口测试
+# ======================================================
+def test_predict_matches_predict_risk_fast(client):
+    response = client.post("/predict", json=DEFAULT_BODY)
+    assert response.status_code == 200
+    prob, risk_level, suggestion = expected_response(DEFAULT_BODY)
+    data = response.json()
+    assert set(data) == {"probability", "risk_level", "recommendation"}
+    assert data["probability"] == pytest.approx(prob, abs=1e-6)
+    assert data["risk_level"] == risk_level
+    assert data["recommendation"] == suggestion
+
+@pytest.mark.parametrize("field, value", [
+    ("Compressiontime", 10.0),
+    ("PreRaddiam", 4.0),
+    ("Heparincategory", 3),
+    ("Priorradpunctures", "yes"),
+])
+def test_predict_rejects_invalid_input(client, field, value):
+    response = client.post("/predict", json={**DEFAULT_BODY, field: value})
+    assert response.status_code == 422
+
+def test_concurrent_requests_match_single_row(client):
+    bodies = list(random_bodies(48))
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(lambda body: client.post("/predict", json=body), bodies))
+    for body, response in zip(bodies, responses):
+        assert response.status_code == 200
+        prob, risk_level, _ = expected_response(body)
+        assert response.json()["probability"] == pytest.approx(prob, abs=1e-6)
+        assert response.json()["risk_level"] == risk_level
+
+# ======================================================
+# 关闭服务时的队列清理
+# ======================================================
+def test_shutdown_fails_in_flight_and_queued_requests(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_batch(X):
+        started.set()
+        release.wait(5)
+        return np.zeros(len(X))
+
+    monkeypatch.setattr(server, "predict_probability_batch", blocking_batch)
+    row = rao_core.encode_features(*DEFAULT_BODY.values())
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        in_flight = loop.create_future()
+        queued = loop.create_future()
+        async with server.lifespan(server.app):
+            await server.app.state.queue.put((row, in_flight))
+            # 等待第一个请求进入模型调用，再放入第二个请求使其停留在队列中
+            await asyncio.to_thread(started.wait, 5)
+            await server.app.state.queue.put((row, queued))
+        # 关闭后放行仍在线程中阻塞的模型调用，asyncio.run 退出时需等待该线程
+        release.set()
+        return in_flight, queued
+
+    try:
+        in_flight, queued = asyncio.run(run())
+    finally:
+        release.set()
+
+    for future in (in_flight, queued):
+        assert future.done()
+        with pytest.raises(RuntimeError, match="shutting down"):
+            future.result()